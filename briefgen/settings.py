@@ -67,6 +67,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'briefgen.wsgi.application'
 
+ASGI_APPLICATION = 'briefgen.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -127,6 +129,28 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Logging - console output; generator DEBUG logs only when DEBUG=True
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'generator': {
+            'handlers': ['console'],
+            'level': 'DEBUG' if DEBUG else 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 
@@ -134,3 +158,6 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 RATE_LIMIT_REQUESTS = 10  # requests per minute per IP
 RATE_LIMIT_WINDOW = 60  # seconds
 
+# Redis (optional) - when set, rate limiting uses a shared Redis counter
+REDIS_URL = os.getenv('REDIS_URL', '')
+
@@ -9,5 +9,9 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.index, name='index'),
     path('api/generate-brief/', views.generate_brief, name='generate_brief'),
+    path('api/generate-brief/stream/', views.generate_brief_stream, name='generate_brief_stream'),
+    path('api/generate-briefs/', views.generate_briefs, name='generate_briefs'),
+    path('api/generate-briefs-batch/', views.generate_briefs_batch, name='generate_briefs_batch'),
+    path('api/batch-status/<str:batch_id>/', views.batch_status, name='batch_status'),
 ]
 
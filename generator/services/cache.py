@@ -0,0 +1,65 @@
+"""
+Semantic cache for generated briefs, keyed by brand name embeddings.
+In production, persist to Redis (HSET + a vector index) so the cache
+is shared across workers.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    In-memory cache that matches near-duplicate brand names.
+
+    Briefs are bucketed by (platform, goal, tone); within a bucket,
+    lookups compare the query embedding against stored embeddings by
+    cosine similarity, so "Acme Co" can hit a brief cached for
+    "Acme Company".
+    """
+
+    def __init__(self, threshold: float = 0.95, max_bucket_size: int = 512):
+        self.threshold = threshold
+        self.max_bucket_size = max_bucket_size
+        # (platform, goal, tone) -> list of (unit embedding, result)
+        self.buckets: Dict[Tuple[str, str, str], List[Tuple[np.ndarray, Dict[str, Any]]]] = {}
+
+    def get(self, bucket_key: Tuple[str, str, str], embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result most similar to the embedding, or None
+        if no entry in the bucket clears the similarity threshold.
+        """
+        bucket = self.buckets.get(bucket_key)
+        if not bucket:
+            return None
+
+        query = self._normalize(embedding)
+        matrix = np.stack([entry[0] for entry in bucket])
+        scores = matrix @ query  # embeddings are unit vectors, dot = cosine
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        # Move the hit to the end so eviction drops the least recently used
+        entry = bucket.pop(best)
+        bucket.append(entry)
+        return entry[1]
+
+    def put(self, bucket_key: Tuple[str, str, str], embedding: List[float], result: Dict[str, Any]) -> None:
+        """Insert a result, evicting the least recently used entry if full."""
+        bucket = self.buckets.setdefault(bucket_key, [])
+        if len(bucket) >= self.max_bucket_size:
+            bucket.pop(0)
+        bucket.append((self._normalize(embedding), result))
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
+
+
+# Global semantic cache instance
+semantic_cache = SemanticCache()
@@ -1,146 +1,622 @@
 """
 LLM service for generating campaign briefs using OpenAI.
 """
+import asyncio
+import copy
+import functools
+import re
 import time
-import json
-from typing import Dict, Any, Optional, Tuple
-from openai import OpenAI
+import uuid
+from typing import Annotated, AsyncIterator, Dict, Any, Literal, Optional, Tuple
+
+import orjson
+from openai import AsyncOpenAI
+from pydantic import BaseModel, StringConstraints
 from django.conf import settings
 
+from .cache import semantic_cache
+
+
+# Exact-match brief cache - simple in-memory store for demo purposes.
+# The input space is tiny (brand x 3 platforms x 3 goals x 3 tones), so
+# repeat requests are common and each saved call avoids a full OpenAI
+# round-trip. In production, use django.core.cache / Redis with a TTL.
+_BRIEF_CACHE: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+_BRIEF_CACHE_MAX_SIZE = 4096
+
+
+# Strict JSON schema for Structured Outputs - the API guarantees the
+# completion conforms (exactly these keys, exactly 3 angles/criteria),
+# so there are no Python-side structure checks and no retry loops on
+# malformed output.
+_BRIEF_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "brief": {"type": "string"},
+        "angles": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {"type": "string"}
+        },
+        "criteria": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {"type": "string"}
+        }
+    },
+    "required": ["brief", "angles", "criteria"],
+    "additionalProperties": False
+}
+
+_BRIEF_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "campaign_brief", "schema": _BRIEF_SCHEMA, "strict": True}
+}
+
+
+def _briefs_response_format(n: int) -> Dict[str, Any]:
+    """Response format for a combined call returning exactly n briefs."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "campaign_briefs",
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "minItems": n,
+                        "maxItems": n,
+                        "items": _BRIEF_SCHEMA
+                    }
+                },
+                "required": ["results"],
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    }
+
+
+def _sse_frame(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a dict as a Server-Sent Events frame."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {orjson.dumps(data).decode()}\n\n"
+
+
+# Static system preamble, kept byte-identical across requests so OpenAI's
+# automatic prompt caching can reuse the shared prefix (cached input
+# tokens are billed at half price and decoded faster). All per-request
+# content goes in the trailing user message - never edit this string
+# per request.
+_SYSTEM_PROMPT = """You are an expert marketing strategist specializing in creator campaigns. \
+Generate concise, actionable campaign briefs. Always return exactly 3 content angles and 3 creator selection criteria. \
+Keep briefs to 4-6 sentences. Be specific and platform-appropriate.
+
+Output contract: respond with a single JSON object containing exactly these keys:
+- "brief": a 4-6 sentence campaign brief as one string
+- "angles": an array of exactly 3 content angle suggestions, each one sentence
+- "criteria": an array of exactly 3 creator selection criteria bullets, each one sentence
+
+Platform guidance:
+- Instagram: lean on polished visual storytelling - Reels, carousels, and Stories. Reference aesthetics, grid cohesion, and save/share behavior. Creators here win on production quality and a recognizable visual identity.
+- TikTok: lean on native, lo-fi, trend-aware formats - hooks in the first two seconds, sounds, duets, and stitches. Reference watch-through rate and comment-driven virality. Creators here win on authenticity and speed.
+- UGC: the content is delivered to the brand for its own channels and ads rather than posted to the creator's audience. Reference ad-ready framing, multiple hook variations, and usage rights. Creators here win on believable, conversion-oriented delivery rather than follower count.
+
+Goal guidance:
+- Awareness: optimize for reach, recall, and shareability. Success metrics are impressions, view-through, and branded-search lift. Angles should make the brand memorable to people who have never heard of it.
+- Conversions: optimize for action. Every angle needs a clear call to action, an offer or reason to act now, and a friction-free path to purchase. Success metrics are click-through, cost per acquisition, and promo-code redemptions.
+- Content Assets: optimize for a reusable library. Deliverables should cover multiple formats, aspect ratios, and hook variants the brand can test in paid placements. Success metrics are asset volume, usability, and downstream ad performance.
+
+Tone guidance:
+- Professional: precise, credible, benefit-led language. No slang, no exclamation marks.
+- Friendly: warm, conversational, first-person language. Approachable but still informative.
+- Playful: witty, energetic, trend-literate language. Humor is welcome when it serves the brand.
+
+Worked example 1:
+Input -> Brand: Lumen Coffee Co. | Platform: Instagram | Goal: Awareness | Tone: Friendly
+Output:
+{"brief": "Lumen Coffee Co. wants more people to recognize its small-batch roasts as the cozy upgrade to their daily cup. Partner with lifestyle and home-cafe creators to showcase slow morning rituals built around Lumen's beans. Content should feel like a friend sharing their favorite brew, not an ad - warm kitchens, pour-overs, and honest first-sip reactions. Prioritize Reels with save-worthy brewing tips so the brand earns shares beyond each creator's following. Every post should make a first-time viewer remember the name Lumen and the feeling of an unhurried morning.", "angles": ["A 'slow morning ritual' Reel where the creator walks through their pour-over routine featuring Lumen beans.", "A save-worthy carousel of three brewing mistakes everyone makes and how Lumen's roast guide fixes them.", "A cozy taste-test Story series comparing Lumen's seasonal roast to the creator's usual grocery-store brand."], "criteria": ["Creators with an established home, food, or lifestyle aesthetic whose audience saves and shares how-to content.", "Engagement rate above platform average with authentic comment conversations, not giveaway-driven spikes.", "A feed whose warm, natural-light visual style matches Lumen's cozy brand identity."]}
+
+Worked example 2:
+Input -> Brand: VoltRun | Platform: TikTok | Goal: Conversions | Tone: Playful
+Output:
+{"brief": "VoltRun's electric scooters need to turn TikTok scrollers into riders, and the fastest route is creators who make commuting look like the best part of the day. Brief creators to open with a two-second hook - racing a bus, beating a friend's car across town - then land the 20% launch-code offer before the midpoint. Keep the energy chaotic-fun but always show the scooter doing real city errands so the purchase feels practical, not impulsive. Every video ends with the creator's discount code on screen and a dare to the viewer to calculate what they spend on rideshares. Comments asking about range and price should get creator replies within a day to keep purchase intent hot.", "angles": ["A 'beat my commute' challenge where the creator races a friend in a car across town and wins on a VoltRun.", "A cost-per-month math bit comparing thirty days of rideshare receipts to one VoltRun payment, played for laughs.", "A duet-bait video daring viewers to stitch their worst public-transit story, answered with a VoltRun test ride."], "criteria": ["Creators in commuter-heavy metro areas whose audience skews 18-34 urban.", "A track record of comment-section responsiveness and video CTAs that drive measurable link clicks.", "Comfort with fast-cut, trend-native editing and on-screen text overlays for promo codes."]}
+
+Worked example 3:
+Input -> Brand: Marlowe Skincare | Platform: UGC | Goal: Content Assets | Tone: Professional
+Output:
+{"brief": "Marlowe Skincare requires a library of ad-ready creator content to fuel its paid social testing program for the upcoming quarter. Commission creators to deliver raw and edited footage demonstrating the three-step barrier repair routine, shot in both 9:16 and 1:1 aspect ratios with clean, well-lit framing suitable for performance placements. Each deliverable set should include a minimum of three distinct hooks - a problem statement, a before-and-after, and an ingredient explainer - so the media team can isolate the strongest opener. All content is delivered directly to Marlowe with full usage rights for paid amplification; creators are not required to post. Consistent product handling, accurate claims language, and dermatologist-reviewed phrasing are mandatory across every asset.", "angles": ["A problem-solution demonstration opening on visibly irritated skin concerns and resolving through the three-step routine.", "A texture-and-application close-up series highlighting the serum's absorption, suitable for cutdowns under ten seconds.", "An ingredient-credibility explainer in which the creator walks through the ceramide complex with on-screen claim citations."], "criteria": ["Demonstrated experience producing direct-response UGC for skincare or beauty brands with portfolio examples.", "Ability to deliver color-corrected footage in multiple aspect ratios with clean audio and accurate claims reads.", "Reliable turnaround within agreed deadlines and willingness to grant full paid usage rights."]}
+
+Follow the same structure, depth, and quality for every request."""
+
+
+class BriefRequest(BaseModel):
+    """
+    Schema for a single brief request.
+
+    Validation runs in compiled pydantic-core: whitespace stripping,
+    length bounds, and the platform/goal/tone allowlists (Literal
+    compiles to a hash-set membership test) all happen in one call,
+    with structured per-field errors. The profanity check stays a
+    separate post-validation step on LLMService.
+    """
+    brand_name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=2, max_length=100)]
+    platform: Literal["Instagram", "TikTok", "UGC"]
+    goal: Literal["Awareness", "Conversions", "Content Assets"]
+    tone: Literal["Professional", "Friendly", "Playful"]
+
 
 class LLMService:
     """Service for interacting with OpenAI API with guardrails."""
-    
-    # Allowed values for validation
-    ALLOWED_PLATFORMS = ["Instagram", "TikTok", "UGC"]
-    ALLOWED_GOALS = ["Awareness", "Conversions", "Content Assets"]
-    ALLOWED_TONES = ["Professional", "Friendly", "Playful"]
-    
+
     # Profanity filter - basic list (in production, use a proper library)
-    PROFANITY_WORDS = {
+    PROFANITY_WORDS = frozenset({
         # Add common profanity words here - keeping minimal for demo
-    }
-    
+    })
+
+    # Compiled once at class definition. A single C-level regex scan of
+    # the brand name matches every word at once, instead of one Python
+    # substring search per word; longest-first alternation keeps
+    # matches greedy. Swap for an Aho-Corasick automaton if the list
+    # ever grows large.
+    _PROFANITY_RE = re.compile(
+        "|".join(re.escape(word) for word in sorted(PROFANITY_WORDS, key=len, reverse=True)),
+        re.IGNORECASE
+    ) if PROFANITY_WORDS else None
+
+
     def __init__(self):
         """Initialize OpenAI client."""
         api_key = settings.OPENAI_API_KEY
         if not api_key:
             raise ValueError("OPENAI_API_KEY not set in environment variables")
-        self.client = OpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key)
     
-    def validate_inputs(self, brand_name: str, platform: str, goal: str, tone: str) -> Tuple[bool, Optional[str]]:
+    def check_brand_name(self, brand_name: str) -> Tuple[bool, Optional[str]]:
         """
-        Validate all inputs with allowlist and profanity checks.
-        
+        Profanity check on the brand name - runs after schema
+        validation (substring match, IGNORECASE replaces lowercasing).
+
         Returns:
             (is_valid, error_message)
         """
-        # Check brand name
-        if not brand_name or not brand_name.strip():
-            return False, "Brand name is required"
-        
-        brand_name_clean = brand_name.strip()
-        if len(brand_name_clean) < 2:
-            return False, "Brand name must be at least 2 characters"
-        if len(brand_name_clean) > 100:
-            return False, "Brand name must be less than 100 characters"
-        
-        # Profanity check on brand name
-        brand_lower = brand_name_clean.lower()
-        for word in self.PROFANITY_WORDS:
-            if word in brand_lower:
-                return False, "Brand name contains inappropriate content"
-        
-        # Allowlist validation for platform
-        if platform not in self.ALLOWED_PLATFORMS:
-            return False, f"Platform must be one of: {', '.join(self.ALLOWED_PLATFORMS)}"
-        
-        # Allowlist validation for goal
-        if goal not in self.ALLOWED_GOALS:
-            return False, f"Goal must be one of: {', '.join(self.ALLOWED_GOALS)}"
-        
-        # Allowlist validation for tone
-        if tone not in self.ALLOWED_TONES:
-            return False, f"Tone must be one of: {', '.join(self.ALLOWED_TONES)}"
-        
+        if self._PROFANITY_RE and self._PROFANITY_RE.search(brand_name):
+            return False, "Brand name contains inappropriate content"
+
         return True, None
     
-    def generate_brief(self, brand_name: str, platform: str, goal: str, tone: str) -> Dict[str, Any]:
+    @staticmethod
+    def _completion_telemetry(start_time: float, usage: Any) -> Dict[str, Any]:
+        """Telemetry block for a live completion."""
+        tokens_prompt = usage.prompt_tokens if usage else 0
+        tokens_completion = usage.completion_tokens if usage else 0
+        details = getattr(usage, "prompt_tokens_details", None) if usage else None
+        tokens_cached = getattr(details, "cached_tokens", 0) or 0
+        # gpt-4o-mini pricing; prompt tokens served from OpenAI's prompt
+        # cache are billed at half the input rate
+        cost = ((tokens_prompt - tokens_cached) * 0.15
+                + tokens_cached * 0.075
+                + tokens_completion * 0.60) / 1_000_000
+        return {
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "tokens_total": usage.total_tokens if usage else 0,
+            "tokens_prompt": tokens_prompt,
+            "tokens_completion": tokens_completion,
+            "tokens_cached_prompt": tokens_cached,
+            "estimated_cost_usd": round(cost, 6),
+            "cache_hit": False
+        }
+
+    @staticmethod
+    def _cached_telemetry(start_time: float, embedding_tokens: int = 0) -> Dict[str, Any]:
+        """Telemetry block for a cache hit - only embedding tokens spent."""
+        return {
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "tokens_total": embedding_tokens,
+            "tokens_prompt": embedding_tokens,
+            "tokens_completion": 0,
+            "tokens_cached_prompt": 0,
+            "estimated_cost_usd": round(embedding_tokens * 0.02 / 1_000_000, 6),  # text-embedding-3-small
+            "cache_hit": True
+        }
+
+    @staticmethod
+    def _build_messages(brand_name: str, platform: str, goal: str, tone: str) -> list:
+        """Build the chat messages for a single brief request.
+
+        The static preamble always comes first and the per-request
+        fields last, so the shared prefix stays cacheable.
+        """
+        user_prompt = f"""Generate a campaign brief for {brand_name}.
+
+Platform: {platform}
+Goal: {goal}
+Tone: {tone}"""
+
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    async def generate_brief(self, brand_name: str, platform: str, goal: str, tone: str) -> Dict[str, Any]:
         """
         Generate campaign brief using OpenAI with structured output.
-        
+
+        Async so the worker can serve other requests while the OpenAI
+        call is in flight.
+
         Returns:
             Dictionary with brief, angles, criteria, and telemetry
         """
-        start_time = time.time()
-        
-        # System prompt - concise and deterministic
-        system_prompt = """You are an expert marketing strategist specializing in creator campaigns. 
-Generate concise, actionable campaign briefs. Always return exactly 3 content angles and 3 creator selection criteria.
-Keep briefs to 4-6 sentences. Be specific and platform-appropriate."""
-        
-        # User prompt - compact and structured
-        user_prompt = f"""Generate a campaign brief for {brand_name}.
+        # perf_counter is monotonic (immune to NTP/wall-clock jumps)
+        # and cheaper than time.time() - right clock for latency telemetry
+        start_time = time.perf_counter()
 
-Platform: {platform}
-Goal: {goal}
-Tone: {tone}
+        # Serve repeat requests straight from the cache - no OpenAI call
+        cache_key = (brand_name.strip().lower(), platform, goal, tone)
+        cached = _BRIEF_CACHE.get(cache_key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["telemetry"] = self._cached_telemetry(start_time)
+            return result
 
-Return a JSON object with:
-- "brief": A 4-6 sentence campaign brief
-- "angles": Array of exactly 3 content angle suggestions
-- "criteria": Array of exactly 3 creator selection criteria bullets"""
-        
         try:
+            # Semantic cache - catches near-duplicate brand names
+            # ("Acme Co" vs "Acme Company") that the exact-match cache misses
+            brand_name_clean = brand_name.strip()
+            bucket_key = (platform, goal, tone)
+            embedding_response = await self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=brand_name_clean
+            )
+            embedding = embedding_response.data[0].embedding
+            embedding_tokens = embedding_response.usage.total_tokens
+
+            cached = semantic_cache.get(bucket_key, embedding)
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result["telemetry"] = self._cached_telemetry(start_time, embedding_tokens)
+                return result
+
             # Call OpenAI with JSON schema for deterministic output
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",  # Using mini for cost efficiency
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},  # Force JSON output
+                messages=self._build_messages(brand_name, platform, goal, tone),
+                response_format=_BRIEF_RESPONSE_FORMAT,  # Schema-guaranteed output
                 temperature=0.4,  # Low temperature for consistency (<= 0.5 as required)
-                max_tokens=600,  # Limit tokens for cost control
+                max_tokens=self.MAX_BRIEF_TOKENS,  # Limit tokens for cost control
                 timeout=30  # Prevent hanging
             )
             
-            # Parse response
+            # Parse response - structure is guaranteed by the schema
             content = response.choices[0].message.content
-            result = json.loads(content)
-            
-            # Validate structure
-            if "brief" not in result or "angles" not in result or "criteria" not in result:
-                raise ValueError("Invalid response structure from LLM")
-            
-            # Ensure arrays have exactly 3 items
-            if not isinstance(result["angles"], list) or len(result["angles"]) != 3:
-                raise ValueError("Angles must be an array of exactly 3 items")
-            
-            if not isinstance(result["criteria"], list) or len(result["criteria"]) != 3:
-                raise ValueError("Criteria must be an array of exactly 3 items")
-            
-            # Calculate telemetry
-            latency_ms = (time.time() - start_time) * 1000
-            tokens_used = response.usage.total_tokens
-            tokens_prompt = response.usage.prompt_tokens
-            tokens_completion = response.usage.completion_tokens
-            
-            return {
+            result = orjson.loads(content)
+
+            # Cache the payload without telemetry - latency/cache_hit are
+            # recomputed per response
+            payload = {
                 "brief": result["brief"],
                 "angles": result["angles"],
-                "criteria": result["criteria"],
-                "telemetry": {
-                    "latency_ms": round(latency_ms, 2),
-                    "tokens_total": tokens_used,
-                    "tokens_prompt": tokens_prompt,
-                    "tokens_completion": tokens_completion,
-                    "estimated_cost_usd": round((tokens_prompt * 0.15 + tokens_completion * 0.60) / 1_000_000, 6)  # Approximate cost for gpt-4o-mini
-                }
+                "criteria": result["criteria"]
             }
+            if len(_BRIEF_CACHE) >= _BRIEF_CACHE_MAX_SIZE:
+                _BRIEF_CACHE.pop(next(iter(_BRIEF_CACHE)))
+            _BRIEF_CACHE[cache_key] = copy.deepcopy(payload)
+            semantic_cache.put(bucket_key, embedding, copy.deepcopy(payload))
+
+            payload["telemetry"] = self._completion_telemetry(start_time, response.usage)
+            return payload
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}")
+        except Exception as e:
+            raise RuntimeError(f"LLM service error: {str(e)}")
+
+    def generate_brief_sync(self, brand_name: str, platform: str, goal: str, tone: str) -> Dict[str, Any]:
+        """Synchronous wrapper for callers outside an event loop."""
+        return asyncio.run(self.generate_brief(brand_name, platform, goal, tone))
+
+    async def generate_brief_stream(self, brand_name: str, platform: str, goal: str, tone: str) -> AsyncIterator[str]:
+        """
+        Stream a campaign brief as Server-Sent Events frames.
+
+        Yields "data:" frames carrying raw token deltas as they arrive,
+        so the client sees output at first-token latency, then a final
+        "event: done" frame with the validated brief and telemetry in
+        the same shape as generate_brief. Cache hits skip the token
+        frames and emit the done frame immediately. Errors after the
+        stream has started are reported as an "event: error" frame
+        since the HTTP status is already sent.
+        """
+        # perf_counter is monotonic (immune to NTP/wall-clock jumps)
+        # and cheaper than time.time() - right clock for latency telemetry
+        start_time = time.perf_counter()
+
+        cache_key = (brand_name.strip().lower(), platform, goal, tone)
+        cached = _BRIEF_CACHE.get(cache_key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["telemetry"] = self._cached_telemetry(start_time)
+            yield _sse_frame(result, event="done")
+            return
+
+        # Everything past the exact-match lookup can hit the network, and
+        # by the time this generator runs the 200/SSE response has been
+        # sent - so it all sits inside the try and failures surface as an
+        # error frame rather than a dead connection
+        try:
+            brand_name_clean = brand_name.strip()
+            bucket_key = (platform, goal, tone)
+            embedding_response = await self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=brand_name_clean
+            )
+            embedding = embedding_response.data[0].embedding
+            embedding_tokens = embedding_response.usage.total_tokens
+
+            cached = semantic_cache.get(bucket_key, embedding)
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result["telemetry"] = self._cached_telemetry(start_time, embedding_tokens)
+                yield _sse_frame(result, event="done")
+                return
+
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=self._build_messages(brand_name, platform, goal, tone),
+                response_format=_BRIEF_RESPONSE_FORMAT,
+                temperature=0.4,
+                max_tokens=self.MAX_BRIEF_TOKENS,
+                timeout=30,
+                stream=True,
+                stream_options={"include_usage": True}  # final chunk carries usage
+            )
+
+            chunks = []
+            usage = None
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delta = chunk.choices[0].delta.content
+                    chunks.append(delta)
+                    yield _sse_frame({"delta": delta})
+
+            # Parse only once the stream has ended - the JSON is complete
+            # (and schema-guaranteed) only as a whole
+            result = orjson.loads("".join(chunks))
+
+            payload = {
+                "brief": result["brief"],
+                "angles": result["angles"],
+                "criteria": result["criteria"]
+            }
+            if len(_BRIEF_CACHE) >= _BRIEF_CACHE_MAX_SIZE:
+                _BRIEF_CACHE.pop(next(iter(_BRIEF_CACHE)))
+            _BRIEF_CACHE[cache_key] = copy.deepcopy(payload)
+            semantic_cache.put(bucket_key, embedding, copy.deepcopy(payload))
+
+            payload["telemetry"] = self._completion_telemetry(start_time, usage)
+            yield _sse_frame(payload, event="done")
+
+        except Exception as e:
+            yield _sse_frame({"error": f"LLM service error: {str(e)}"}, event="error")
+
+    # Briefs per combined call - keeps the combined completion inside a
+    # sane max_tokens budget
+    MAX_BRIEFS_PER_CALL = 10
+
+    # Completion budget per brief. A typical brief + 3 angles + 3
+    # criteria runs ~250-350 tokens; decoding time is roughly linear in
+    # output tokens, so a tight ceiling bounds tail latency and cost
+    # without clipping normal responses.
+    MAX_BRIEF_TOKENS = 400
+
+    async def generate_briefs(self, inputs: list) -> Dict[str, Any]:
+        """
+        Generate several briefs in one chat completion.
+
+        One combined call sends the static system prompt once instead
+        of N times, counts as a single request against OpenAI rate
+        limits, and pays one round-trip of overhead rather than N.
+
+        Args:
+            inputs: List of dicts with brand_name/platform/goal/tone
+                keys, at most MAX_BRIEFS_PER_CALL entries
+
+        Returns:
+            Dictionary with a "results" list (one validated brief per
+            input, in order, each with approximate per-entry telemetry)
+            and an overall "telemetry" block
+        """
+        if not inputs:
+            raise ValueError("inputs must not be empty")
+        if len(inputs) > self.MAX_BRIEFS_PER_CALL:
+            raise ValueError(f"inputs must contain at most {self.MAX_BRIEFS_PER_CALL} items")
+
+        # perf_counter is monotonic (immune to NTP/wall-clock jumps)
+        # and cheaper than time.time() - right clock for latency telemetry
+        start_time = time.perf_counter()
+        n = len(inputs)
+
+        entries = "\n\n".join(
+            f"""Request {i + 1}:
+Brand: {item['brand_name']}
+Platform: {item['platform']}
+Goal: {item['goal']}
+Tone: {item['tone']}"""
+            for i, item in enumerate(inputs)
+        )
+        user_prompt = f"""Generate one campaign brief for each of the {n} requests below.
+
+{entries}
+
+Return a JSON object with a single key "results": an array of exactly {n} brief objects (each with "brief", "angles", "criteria"), one per request, in the same order as the requests."""
+
+        try:
+            response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format=_briefs_response_format(n),
+                temperature=0.4,
+                max_tokens=self.MAX_BRIEF_TOKENS * n,  # Same per-brief budget as single calls
+                timeout=60
+            )
+
+            content = response.choices[0].message.content
+            parsed = orjson.loads(content)
+
+            results = parsed["results"]
+
+            telemetry = self._completion_telemetry(start_time, response.usage)
+            payloads = []
+            for item, result in zip(inputs, results):
+                payload = {
+                    "brief": result["brief"],
+                    "angles": result["angles"],
+                    "criteria": result["criteria"]
+                }
+
+                # Seed the exact-match cache so follow-up single
+                # requests for the same inputs are free
+                cache_key = (item["brand_name"].strip().lower(),
+                             item["platform"], item["goal"], item["tone"])
+                if len(_BRIEF_CACHE) >= _BRIEF_CACHE_MAX_SIZE:
+                    _BRIEF_CACHE.pop(next(iter(_BRIEF_CACHE)))
+                _BRIEF_CACHE[cache_key] = copy.deepcopy(payload)
+
+                # Per-entry telemetry is an even split - token usage is
+                # only reported for the call as a whole
+                payload["telemetry"] = {
+                    "latency_ms": telemetry["latency_ms"],
+                    "tokens_completion_approx": round(telemetry["tokens_completion"] / n),
+                    "estimated_cost_usd": round(telemetry["estimated_cost_usd"] / n, 6),
+                    "cache_hit": False
+                }
+                payloads.append(payload)
+
+            return {"results": payloads, "telemetry": telemetry}
+
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {str(e)}")
+        except ValueError:
+            raise
         except Exception as e:
             raise RuntimeError(f"LLM service error: {str(e)}")
 
+    async def generate_briefs_batch(self, inputs: list) -> Dict[str, Any]:
+        """
+        Submit brief requests to the OpenAI Batch API.
+
+        Batch completions are billed at 50% of the synchronous rate and
+        bypass per-minute rate limits, at the cost of up-to-24h
+        turnaround - suited to pre-generating briefs offline, not
+        interactive use.
+
+        Args:
+            inputs: List of dicts with brand_name/platform/goal/tone keys
+
+        Returns:
+            Dictionary with the batch id and the custom_id assigned to
+            each input, for matching results when the batch completes
+        """
+        requests = []
+        lines = []
+        for item in inputs:
+            custom_id = str(uuid.uuid4())
+            lines.append(orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": "gpt-4o-mini",
+                    "messages": self._build_messages(
+                        item["brand_name"], item["platform"], item["goal"], item["tone"]
+                    ),
+                    "response_format": _BRIEF_RESPONSE_FORMAT,
+                    "temperature": 0.4,
+                    "max_tokens": self.MAX_BRIEF_TOKENS
+                }
+            }).decode())
+            requests.append({"custom_id": custom_id, **item})
+
+        try:
+            batch_file = await self.client.files.create(
+                file=("briefs.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            raise RuntimeError(f"LLM service error: {str(e)}")
+
+        return {"batch_id": batch.id, "requests": requests}
+
+    async def get_batch_status(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Poll a batch and, once completed, return the generated briefs.
+
+        Returns:
+            Dictionary with the batch status; when the batch has
+            completed, also a "briefs" list of per-request results
+            keyed by custom_id
+        """
+        try:
+            batch = await self.client.batches.retrieve(batch_id)
+
+            status = {
+                "batch_id": batch.id,
+                "status": batch.status,
+                "request_counts": {
+                    "total": batch.request_counts.total,
+                    "completed": batch.request_counts.completed,
+                    "failed": batch.request_counts.failed
+                } if batch.request_counts else None
+            }
+
+            if batch.status == "completed" and batch.output_file_id:
+                output = await self.client.files.content(batch.output_file_id)
+                briefs = []
+                for line in output.text.splitlines():
+                    if not line.strip():
+                        continue
+                    # Per-line error handling - one malformed line yields
+                    # a per-entry error instead of failing the whole poll
+                    brief = {"custom_id": None}
+                    try:
+                        entry = orjson.loads(line)
+                        brief["custom_id"] = entry.get("custom_id")
+                        response_body = (entry.get("response") or {}).get("body") or {}
+                        content = response_body["choices"][0]["message"]["content"]
+                        brief.update(orjson.loads(content))
+                    except (KeyError, IndexError, TypeError, ValueError, orjson.JSONDecodeError) as e:
+                        brief["error"] = f"Invalid batch result: {str(e)}"
+                    briefs.append(brief)
+                status["briefs"] = briefs
+
+            return status
+
+        except Exception as e:
+            raise RuntimeError(f"LLM service error: {str(e)}")
+
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """
+    Return the shared LLMService instance.
+
+    Lazy so a missing OPENAI_API_KEY surfaces on the first request
+    instead of at import time. Reusing one instance keeps the OpenAI
+    client's connection pool warm across requests.
+    """
+    return LLMService()
@@ -1,59 +1,141 @@
 """
-Simple in-memory rate limiter for demo purposes.
-In production, use Redis or similar.
+Rate limiting for the brief API.
+
+The in-memory RateLimiter is the demo default. When REDIS_URL is set,
+the Redis-backed fixed-window limiter is used instead - it survives
+restarts and enforces one shared limit across gunicorn workers/hosts.
 """
 from typing import Any
 
 
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, deque
 from django.conf import settings
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
 
 class RateLimiter:
     """Simple rate limiter using in-memory storage."""
-    
+
+    # Bound on tracked IPs - keeps memory O(active clients) rather than
+    # one deque per unique IP ever seen (an OOM risk under DDoS)
+    MAX_TRACKED_IPS = 100_000
+
     def __init__(self):
-        self.requests = defaultdict[Any, list](list)
+        self.requests = OrderedDict[Any, deque]()
         self.max_requests = settings.RATE_LIMIT_REQUESTS
         self.window_seconds = settings.RATE_LIMIT_WINDOW
-    
-    def is_allowed(self, ip_address: str) -> bool:
+        # Guards self.requests - gunicorn threaded workers and Django's
+        # ASGI thread pool call into this concurrently
+        self._lock = threading.Lock()
+
+    def _get_queue(self, ip_address: str) -> deque:
+        """Fetch the per-IP deque, tracking recency and evicting the
+        least recently seen IP once the cap is hit."""
+        queue = self.requests.get(ip_address)
+        if queue is None:
+            queue = self.requests[ip_address] = deque()
+        else:
+            self.requests.move_to_end(ip_address)
+        if len(self.requests) > self.MAX_TRACKED_IPS:
+            self.requests.popitem(last=False)
+        return queue
+
+    def _evict_expired(self, queue: deque, now: float) -> None:
+        """Drop timestamps that fell out of the window - O(1) per entry."""
+        cutoff = now - self.window_seconds
+        while queue and queue[0] < cutoff:
+            queue.popleft()
+
+    async def is_allowed(self, ip_address: str) -> bool:
         """
         Check if request is allowed based on rate limit.
-        
+
+        Async to match the Redis-backed limiter's interface; the work
+        itself is in-memory and returns immediately.
+
         Args:
             ip_address: Client IP address
-            
+
         Returns:
             True if request is allowed, False otherwise
         """
         now = time.time()
-        
-        # Clean old requests outside the window
-        self.requests[ip_address] = [
-            req_time for req_time in self.requests[ip_address]
-            if now - req_time < self.window_seconds
-        ]
-        
-        # Check if limit exceeded
-        if len(self.requests[ip_address]) >= self.max_requests:
-            return False
-        
-        # Record this request
-        self.requests[ip_address].append(now)
-        return True
-    
-    def get_remaining(self, ip_address: str) -> int:
+        with self._lock:
+            queue = self._get_queue(ip_address)
+
+            # Timestamps are appended in order, so expired entries are
+            # always at the front - no full rebuild needed
+            self._evict_expired(queue, now)
+
+            # Check if limit exceeded
+            if len(queue) >= self.max_requests:
+                return False
+
+            # Record this request
+            queue.append(now)
+            return True
+
+    async def get_remaining(self, ip_address: str) -> int:
         """Get remaining requests for IP address."""
         now = time.time()
-        self.requests[ip_address] = [
-            req_time for req_time in self.requests[ip_address]
-            if now - req_time < self.window_seconds
-        ]
-        return max(0, self.max_requests - len(self.requests[ip_address]))
+        with self._lock:
+            queue = self._get_queue(ip_address)
+            self._evict_expired(queue, now)
+            return max(0, self.max_requests - len(queue))
+
+
+class RedisRateLimiter:
+    """
+    Fixed-window rate limiter backed by Redis.
+
+    Each (IP, window) pair maps to a single integer counter bumped with
+    INCR; EXPIRE NX sets the TTL only when the key is first created, so
+    a check is one pipelined round-trip with no locks or list scans.
+    The limit is shared across all workers and survives restarts.
+    """
+
+    def __init__(self, redis_url: str):
+        # Async client - the views run on the event loop, and a blocking
+        # Redis round-trip there would stall every in-flight request
+        self.client = redis.asyncio.Redis.from_url(redis_url, decode_responses=True)
+        self.max_requests = settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = settings.RATE_LIMIT_WINDOW
+
+    def _key(self, ip_address: str, now: float) -> str:
+        return f"rl:{ip_address}:{int(now // self.window_seconds)}"
+
+    async def is_allowed(self, ip_address: str) -> bool:
+        """
+        Check if request is allowed based on rate limit.
+
+        Args:
+            ip_address: Client IP address
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        key = self._key(ip_address, time.time())
+        pipe = self.client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, self.window_seconds, nx=True)
+        count, _ = await pipe.execute()
+        return count <= self.max_requests
+
+    async def get_remaining(self, ip_address: str) -> int:
+        """Get remaining requests for IP address."""
+        count = await self.client.get(self._key(ip_address, time.time()))
+        return max(0, self.max_requests - int(count or 0))
 
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+if getattr(settings, 'REDIS_URL', '') and redis is not None:
+    rate_limiter = RedisRateLimiter(settings.REDIS_URL)
+else:
+    rate_limiter = RateLimiter()
 
@@ -1,23 +1,41 @@
 """
 Views for the AI Brief Generator.
 """
-import json
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+import logging
+
+import orjson
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.shortcuts import render
-from .services.llm import LLMService
+from pydantic import ValidationError
+from .services.llm import BriefRequest, get_llm_service
 from .services.rate_limiter import rate_limiter
 
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(HttpResponse):
+    """JsonResponse equivalent serialized with orjson.
+
+    orjson serializes in native code and emits bytes directly, skipping
+    the stdlib's str build + encode on every response.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data), **kwargs)
+
 
 def get_client_ip(request):
     """Extract client IP address from request."""
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
-    return ip
+        # partition stops at the first comma instead of splitting the
+        # whole proxy chain into a list; the length clamp (45 = max
+        # IPv6 textual length) keeps oversized junk out of rate-limiter
+        # keys
+        ip, _, _ = x_forwarded_for.partition(',')
+        return ip.strip()[:45]
+    return request.META.get('REMOTE_ADDR')
 
 
 def index(request):
@@ -25,12 +43,48 @@ def index(request):
     return render(request, 'generator/index.html')
 
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def generate_brief(request):
+def _clean_brief_inputs(inputs, llm_service, max_items):
+    """
+    Validate a list of brief inputs up front so a bad entry fails the
+    whole submission before any tokens are spent.
+
+    Returns:
+        (cleaned_inputs, None) on success, (None, ORJSONResponse) on error
+    """
+    if not isinstance(inputs, list) or not inputs:
+        return None, ORJSONResponse({
+            "error": "inputs must be a non-empty list"
+        }, status=400)
+    if len(inputs) > max_items:
+        return None, ORJSONResponse({
+            "error": f"inputs must contain at most {max_items} items"
+        }, status=400)
+
+    cleaned = []
+    for i, item in enumerate(inputs):
+        try:
+            brief_request = BriefRequest.model_validate(item)
+        except ValidationError as e:
+            return None, ORJSONResponse({
+                "error": f"inputs[{i}] is invalid",
+                "errors": e.errors(include_url=False)
+            }, status=400)
+        is_valid, error_message = llm_service.check_brand_name(brief_request.brand_name)
+        if not is_valid:
+            return None, ORJSONResponse({
+                "error": f"inputs[{i}]: {error_message}"
+            }, status=400)
+        cleaned.append(brief_request.model_dump())
+    return cleaned, None
+
+
+async def generate_brief(request):
     """
     API endpoint to generate campaign brief.
-    
+
+    Async view: the worker stays free to serve other requests while the
+    OpenAI call is in flight (run under ASGI for full benefit).
+
     Expected JSON payload:
     {
         "brand_name": "string",
@@ -38,65 +92,279 @@ def generate_brief(request):
         "goal": "Awareness" | "Conversions" | "Content Assets",
         "tone": "Professional" | "Friendly" | "Playful"
     }
-    
+
     Returns JSON response with brief, angles, criteria, and telemetry.
     """
+    # Method check done inline - the require_http_methods/csrf_exempt
+    # decorators don't support async views on Django 4.2
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
     # Rate limiting
     client_ip = get_client_ip(request)
-    if not rate_limiter.is_allowed(client_ip):
-        return JsonResponse({
+    if not await rate_limiter.is_allowed(client_ip):
+        return ORJSONResponse({
             "error": "Rate limit exceeded. Please try again later.",
             "remaining": 0
         }, status=429)
     
     # Parse request body
     try:
-        data = json.loads(request.body)
-    except json.JSONDecodeError:
-        return JsonResponse({
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
             "error": "Invalid JSON in request body"
         }, status=400)
     
-    # Extract inputs
-    brand_name = data.get('brand_name', '').strip()
-    platform = data.get('platform', '').strip()
-    goal = data.get('goal', '').strip()
-    tone = data.get('tone', '').strip()
+    # Validate inputs - the schema runs in compiled pydantic-core and
+    # returns structured per-field errors
+    try:
+        brief_request = BriefRequest.model_validate(data)
+    except ValidationError as e:
+        return ORJSONResponse({
+            "error": "Invalid input",
+            "errors": e.errors(include_url=False)
+        }, status=400)
+
+    # brand_name deliberately left out - don't leak user input to logs
+    logger.debug("brief request: platform=%s goal=%s tone=%s",
+                 brief_request.platform, brief_request.goal, brief_request.tone)
+
+    # Profanity check stays a separate post-validation step
+    llm_service = get_llm_service()
+    is_valid, error_message = llm_service.check_brand_name(brief_request.brand_name)
 
-    print(brand_name, platform, goal, tone)
-    
-    # Validate inputs using LLM service
-    llm_service = LLMService()
-    is_valid, error_message = llm_service.validate_inputs(
-        brand_name, platform, goal, tone
-    )
-    
     if not is_valid:
-        return JsonResponse({
+        return ORJSONResponse({
             "error": error_message
         }, status=400)
     
     # Generate brief
     try:
-        result = llm_service.generate_brief(brand_name, platform, goal, tone)
+        result = await llm_service.generate_brief(
+            brief_request.brand_name, brief_request.platform,
+            brief_request.goal, brief_request.tone
+        )
         
         # Add rate limit info
         result["rate_limit"] = {
-            "remaining": rate_limiter.get_remaining(client_ip)
+            "remaining": await rate_limiter.get_remaining(client_ip)
         }
         
-        return JsonResponse(result, status=200)
+        return ORJSONResponse(result, status=200)
         
     except ValueError as e:
-        return JsonResponse({
+        return ORJSONResponse({
             "error": f"Validation error: {str(e)}"
         }, status=400)
     except RuntimeError as e:
-        return JsonResponse({
+        return ORJSONResponse({
             "error": f"Service error: {str(e)}"
         }, status=500)
     except Exception as e:
-        return JsonResponse({
+        return ORJSONResponse({
             "error": f"Unexpected error: {str(e)}"
         }, status=500)
 
+
+generate_brief.csrf_exempt = True
+
+
+async def generate_brief_stream(request):
+    """
+    SSE endpoint that streams a campaign brief as it is generated.
+
+    Same payload as generate_brief. Emits "data:" frames with token
+    deltas, then an "event: done" frame carrying the validated brief
+    plus telemetry, so time-to-first-byte is first-token latency
+    instead of full-completion latency.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    # Rate limiting
+    client_ip = get_client_ip(request)
+    if not await rate_limiter.is_allowed(client_ip):
+        return ORJSONResponse({
+            "error": "Rate limit exceeded. Please try again later.",
+            "remaining": 0
+        }, status=429)
+
+    # Parse request body
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
+            "error": "Invalid JSON in request body"
+        }, status=400)
+
+    # Validate inputs - the schema runs in compiled pydantic-core and
+    # returns structured per-field errors
+    try:
+        brief_request = BriefRequest.model_validate(data)
+    except ValidationError as e:
+        return ORJSONResponse({
+            "error": "Invalid input",
+            "errors": e.errors(include_url=False)
+        }, status=400)
+
+    # Profanity check stays a separate post-validation step
+    llm_service = get_llm_service()
+    is_valid, error_message = llm_service.check_brand_name(brief_request.brand_name)
+
+    if not is_valid:
+        return ORJSONResponse({
+            "error": error_message
+        }, status=400)
+
+    response = StreamingHttpResponse(
+        llm_service.generate_brief_stream(
+            brief_request.brand_name, brief_request.platform,
+            brief_request.goal, brief_request.tone
+        ),
+        content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Disable proxy buffering
+    response["X-RateLimit-Remaining"] = str(await rate_limiter.get_remaining(client_ip))
+    return response
+
+
+generate_brief_stream.csrf_exempt = True
+
+
+async def generate_briefs_batch(request):
+    """
+    API endpoint to submit briefs to the OpenAI Batch API.
+
+    Expected JSON payload:
+    {
+        "inputs": [
+            {"brand_name": "...", "platform": "...", "goal": "...", "tone": "..."},
+            ...
+        ]
+    }
+
+    Batch generation is 50% cheaper but takes up to 24h; poll
+    api/batch-status/<batch_id>/ for results.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    # Rate limiting
+    client_ip = get_client_ip(request)
+    if not await rate_limiter.is_allowed(client_ip):
+        return ORJSONResponse({
+            "error": "Rate limit exceeded. Please try again later.",
+            "remaining": 0
+        }, status=429)
+
+    # Parse request body
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
+            "error": "Invalid JSON in request body"
+        }, status=400)
+
+    llm_service = get_llm_service()
+    cleaned, error_response = _clean_brief_inputs(data.get('inputs'), llm_service, max_items=100)
+    if error_response is not None:
+        return error_response
+
+    try:
+        result = await llm_service.generate_briefs_batch(cleaned)
+        return ORJSONResponse(result, status=202)
+    except RuntimeError as e:
+        return ORJSONResponse({
+            "error": f"Service error: {str(e)}"
+        }, status=500)
+
+
+generate_briefs_batch.csrf_exempt = True
+
+
+async def generate_briefs(request):
+    """
+    API endpoint to generate several briefs in one LLM call.
+
+    Expected JSON payload:
+    {
+        "inputs": [
+            {"brand_name": "...", "platform": "...", "goal": "...", "tone": "..."},
+            ...
+        ]
+    }
+
+    At most 10 inputs per request. Unlike the Batch API endpoint, this
+    is synchronous - one combined completion amortizes the system
+    prompt and round-trip overhead across all inputs.
+    """
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    # Rate limiting
+    client_ip = get_client_ip(request)
+    if not await rate_limiter.is_allowed(client_ip):
+        return ORJSONResponse({
+            "error": "Rate limit exceeded. Please try again later.",
+            "remaining": 0
+        }, status=429)
+
+    # Parse request body
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
+            "error": "Invalid JSON in request body"
+        }, status=400)
+
+    llm_service = get_llm_service()
+    cleaned, error_response = _clean_brief_inputs(
+        data.get('inputs'), llm_service, max_items=llm_service.MAX_BRIEFS_PER_CALL
+    )
+    if error_response is not None:
+        return error_response
+
+    try:
+        result = await llm_service.generate_briefs(cleaned)
+
+        # Add rate limit info
+        result["rate_limit"] = {
+            "remaining": await rate_limiter.get_remaining(client_ip)
+        }
+
+        return ORJSONResponse(result, status=200)
+
+    except ValueError as e:
+        return ORJSONResponse({
+            "error": f"Validation error: {str(e)}"
+        }, status=400)
+    except RuntimeError as e:
+        return ORJSONResponse({
+            "error": f"Service error: {str(e)}"
+        }, status=500)
+
+
+generate_briefs.csrf_exempt = True
+
+
+async def batch_status(request, batch_id):
+    """
+    API endpoint to poll a submitted batch.
+
+    Returns the batch status and, once completed, the generated briefs
+    keyed by the custom_ids returned at submission.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    llm_service = get_llm_service()
+    try:
+        result = await llm_service.get_batch_status(batch_id)
+        return ORJSONResponse(result, status=200)
+    except RuntimeError as e:
+        return ORJSONResponse({
+            "error": f"Service error: {str(e)}"
+        }, status=500)
+